@@ -1,3 +1,23 @@
+#///////////////////////
+#  make_SpacedArray ///
+#/////////////////////
+#----------------------------------------------------------------------------
+# make_SpacedArray input array of lead coordinates spaces evenly geodetically
+#----------------------------------------------------------------------------
+#////////////////////////////////
+#  transform_coords_chunked  ///
+#//////////////////////////////
+#---------------------------------------------------------------------
+# Transform coordinates between CRS in fixed-size chunks.
+#---------------------------------------------------------------------
+#//////////////////////////
+#  densify_SeedPoints  ///
+#////////////////////////
+#---------------------------------------------------------------------
+# Densify clicked points into evenly spaced active contour nodes.
+#---------------------------------------------------------------------
+
+
 #///////////////////////
 #  make_SpacedArray ///
 #/////////////////////
@@ -103,4 +123,230 @@ Latest recorded update:
         plt.xlabel('Site Index')
         plt.ylim(np.mean(dsarray)-2*error_km,np.mean(dsarray)+2*error_km)
     
-    return LatArray, LonArray
\ No newline at end of file
+    return LatArray, LonArray
+
+
+
+#////////////////////////////////
+#  transform_coords_chunked  ///
+#//////////////////////////////
+#---------------------------------------------------------------------
+# Transform coordinates between CRS in fixed-size chunks.
+#---------------------------------------------------------------------
+# DEPENDENCIES:
+import functools
+import numpy as np
+from pyproj import CRS, Transformer
+#---------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=16)
+def _get_Transformer(src_srs, dst_srs):
+    # build pyproj Transformer once per (source, destination) CRS pair,
+    # keyed on CRS srs strings (WKT is not available for all proj4 definitions)
+    # always_xy so geographic CRS are handled as (lon, lat)
+    return Transformer.from_crs(CRS.from_user_input(src_srs), CRS.from_user_input(dst_srs), always_xy=True)
+
+
+def transform_coords_chunked(x, y, src_crs = CRS.from_epsg(4326), dst_crs = CRS.from_epsg(4326),
+                             out_x = None, out_y = None, chunk_size = 500000, lon_360 = True):
+    
+    """Transform coordinates from one CRS to another in fixed-size chunks.
+    Uses a cached pyproj Transformer and writes results directly into the output
+    arrays, so peak memory stays at one chunk regardless of input size. Inputs may
+    be memory-mapped (np.memmap / np.load(mmap_mode='r')) and of any shape (e.g. full
+    MODIS swath lat/lon grids).
+    
+INPUT:
+- x: array of x coordinates (longitudes if src_crs is geographic, 0-360 or -180-180 accepted)
+- y: array of y coordinates (latitudes if src_crs is geographic), same shape as x
+- src_crs: CRS of input coordinates, pyproj CRS or cartopy projection
+           (default: CRS.from_epsg(4326))
+- dst_crs: CRS of output coordinates, pyproj CRS or cartopy projection
+           (e.g. ccrs.NorthPolarStereo(central_longitude=215)) (default: CRS.from_epsg(4326))
+- out_x: None, preallocated float64 array, or filename of .npy file to create as memmap
+         for output x coordinates (default: None, allocates new array)
+- out_y: None, preallocated float64 array, or filename of .npy file to create as memmap
+         for output y coordinates (default: None, allocates new array)
+- chunk_size: number of coordinates transformed at once (default: 500000)
+- lon_360: bool, whether to return longitudes in range (0, 360) when dst_crs is geographic,
+           matching get_MODISgeo and make_SpacedArray (default: True)
+
+OUTPUT:
+- out_x: transformed x coordinates (longitudes if dst_crs is geographic), shape of x
+- out_y: transformed y coordinates (latitudes if dst_crs is geographic), shape of y
+
+DEPENDENCIES:
+import functools
+import numpy as np
+from pyproj import CRS, Transformer
+
+Latest recorded update:
+10-19-2026
+
+    """
+    
+    assert np.shape(x) == np.shape(y), f"x and y must have same shape, got: {np.shape(x)}, {np.shape(y)}"
+    
+    src_crs = CRS.from_user_input(src_crs)
+    dst_crs = CRS.from_user_input(dst_crs)
+    transformer = _get_Transformer(src_crs.srs, dst_crs.srs)
+    
+    # set up output arrays: allocate new, create memmap from filename, or use given array
+    #-------------------------------------------------------------------------------------
+    shape = np.shape(x)
+    outputs = []
+    for out in [out_x, out_y]:
+        if out is None:
+            out = np.empty(shape, dtype=np.float64)
+        elif isinstance(out, str):
+            out = np.lib.format.open_memmap(out, mode='w+', dtype=np.float64, shape=shape)
+        assert out.shape == shape, f"output shape must match input shape {shape}, got: {out.shape}"
+        assert out.dtype == np.float64 and out.flags['C_CONTIGUOUS'], "output arrays must be C-contiguous float64"
+        outputs.append(out)
+    out_x, out_y = outputs
+    
+    # flattened views of inputs and outputs (no copies for contiguous inputs / memmaps)
+    x_flat = np.reshape(x, -1)
+    y_flat = np.reshape(y, -1)
+    ox_flat = out_x.reshape(-1)
+    oy_flat = out_y.reshape(-1)
+    
+    # transform coordinates one chunk at a time
+    #------------------------------------------
+    for i0 in range(0, x_flat.shape[0], chunk_size):
+        i1 = min(i0 + chunk_size, x_flat.shape[0])
+        
+        # copy input chunk into output slice then transform in place
+        ox = ox_flat[i0:i1]
+        oy = oy_flat[i0:i1]
+        ox[:] = x_flat[i0:i1]
+        oy[:] = y_flat[i0:i1]
+        
+        # bring 0-360 longitudes into range (-180, 180)
+        if src_crs.is_geographic:
+            ox[ox > 180] -= 360
+            
+        transformer.transform(ox, oy, inplace=True)
+        
+        # make all longitudes range (0,360)
+        if dst_crs.is_geographic and lon_360 == True:
+            ox[ox < 0] += 360
+            
+    # write memory-mapped outputs to disk
+    for out in [out_x, out_y]:
+        if isinstance(out, np.memmap):
+            out.flush()
+    
+    return out_x, out_y
+
+
+#//////////////////////////
+#  densify_SeedPoints  ///
+#////////////////////////
+#---------------------------------------------------------------------
+# Densify clicked points into evenly spaced active contour nodes.
+#---------------------------------------------------------------------
+# DEPENDENCIES:
+import numpy as np
+#---------------------------------------------------------------------
+
+def _resample_ArcLength(col, row, num_nodes):
+    # place num_nodes evenly by arc length along polyline (col, row)
+    arc = np.append(0, np.cumsum(np.hypot(np.diff(col), np.diff(row))))
+    arc_new = np.linspace(0, arc[-1], num_nodes)
+    return np.interp(arc_new, arc, col), np.interp(arc_new, arc, row)
+
+
+def densify_SeedPoints(Coordinates, spacing_px = 5, min_sep_px = 1, image = None, snap_radius_px = 0):
+    
+    """Densify clicked points into initial snake for active contour model.
+    Nodes are spaced evenly by arc length along the clicked polyline, so
+    node count scales with lead length rather than number of clicks
+    (minimum 4 nodes, as needed by active_contour with free boundaries).
+    Optionally snaps nodes to local image minimum (dark = warm in band 31
+    images plotted with 'Greys' colormap, where leads appear dark).
+    
+INPUT:
+- Coordinates: array of clicked points in image axes units (Nx2 with [x, y] = [col, row])
+- spacing_px: desired arc length spacing between nodes (pixels) (default: 5)
+- min_sep_px: clicked points closer than this to the last kept point are dropped (pixels)
+              (default: 1)
+- image: None or image array (2D, or RGB/RGBA image read with skimage.io) used for snapping
+         (default: None)
+- snap_radius_px: half-width of square window in which each node is moved to the 
+                  local image minimum, 0 for no snapping (pixels) (default: 0)
+                  ties (e.g. saturated lead pixels) go to the minimum nearest the node.
+                  Snapped nodes that collapse onto or fall behind the previous node
+                  are dropped and the snapped polyline is re-spaced evenly by arc
+                  length. If fewer than two snapped nodes remain, unsnapped nodes
+                  are returned.
+
+OUTPUT:
+- init: Mx2 array of [row, col] node coordinates for skimage active_contour
+
+DEPENDENCIES:
+import numpy as np
+
+Latest recorded update:
+10-19-2026
+
+    """
+    
+    Coordinates = np.asarray(Coordinates, dtype=float).reshape(-1, 2)
+    assert Coordinates.shape[0] > 1, "need at least two distinct points to build snake"
+    
+    # drop near-coincident clicks (compared to last kept click)
+    #----------------------------------------------------------
+    keep = [0]
+    for ii in range(1, Coordinates.shape[0]):
+        if np.hypot(*(Coordinates[ii] - Coordinates[keep[-1]])) >= min_sep_px:
+            keep.append(ii)
+    Coordinates = Coordinates[keep]
+    assert Coordinates.shape[0] > 1, "need at least two distinct points to build snake"
+    
+    # interpolate evenly by arc length along polyline
+    #------------------------------------------------
+    arc_length = np.sum(np.hypot(*np.diff(Coordinates, axis=0).T))
+    num_nodes = max(int(round(arc_length/spacing_px)), 3) + 1
+    col, row = _resample_ArcLength(Coordinates[:,0], Coordinates[:,1], num_nodes)
+    
+    # snap nodes to local minimum of image within snap_radius_px
+    #-----------------------------------------------------------
+    if image is not None and snap_radius_px > 0:
+        image = np.asarray(image, dtype=float)
+        # collapse RGB(A) image to grayscale
+        if image.ndim == 3:
+            image = image[:,:,:3].mean(axis=2)
+        # gather image values in window around each node (num_nodes x window size)
+        offsets = np.arange(-snap_radius_px, snap_radius_px+1)
+        d_row, d_col = [d.ravel() for d in np.meshgrid(offsets, offsets, indexing='ij')]
+        rows = np.clip(np.round(row).astype(int)[:,None] + d_row, 0, image.shape[0]-1)
+        cols = np.clip(np.round(col).astype(int)[:,None] + d_col, 0, image.shape[1]-1)
+        # among window minima, pick the one nearest the node
+        values = image[rows, cols]
+        is_min = values == values.min(axis=1)[:,None]
+        dist = np.hypot(rows - row[:,None], cols - col[:,None])
+        index = np.argmin(np.where(is_min, dist, np.inf), axis=1)
+        # direction of polyline at each node, before snapping
+        t_row, t_col = np.gradient(row), np.gradient(col)
+        snap_row = rows[np.arange(num_nodes), index].astype(float)
+        snap_col = cols[np.arange(num_nodes), index].astype(float)
+        # drop snapped nodes that collapse onto or fall behind previous node
+        # along polyline direction, repeating until node order is preserved
+        while snap_row.shape[0] > 1:
+            advance = np.diff(snap_row)*t_row[1:] + np.diff(snap_col)*t_col[1:]
+            if np.all(advance > 0):
+                break
+            keep = np.append(True, advance > 0)
+            snap_row, snap_col, t_row, t_col = snap_row[keep], snap_col[keep], t_row[keep], t_col[keep]
+        # re-space snapped polyline evenly by arc length,
+        # or keep unsnapped nodes if snapped polyline collapsed
+        if snap_row.shape[0] > 1:
+            col, row = _resample_ArcLength(snap_col, snap_row, num_nodes)
+        else:
+            print('snapped nodes collapsed to a single point, returning unsnapped nodes')
+    
+    # stack to [row, col] for active_contour
+    init = np.array([row, col]).T
+    
+    return init
@@ -0,0 +1,335 @@
+#//////////////////////
+#  make_Transects  ///
+#////////////////////
+#---------------------------------------------------------------------
+# Make fixed geodesic transects from origin points and azimuths.
+#---------------------------------------------------------------------
+#////////////////////////
+#  sample_Transects  ///
+#//////////////////////
+#---------------------------------------------------------------------
+# Sample swath imagery along transects (nearest pixel).
+#---------------------------------------------------------------------
+#///////////////////////
+#  locate_LeadPeak  ///
+#/////////////////////
+#---------------------------------------------------------------------
+# Locate lead along transects as warm-anomaly peak.
+#---------------------------------------------------------------------
+#//////////////////////////////
+#  extract_LeadTimeseries  ///
+#////////////////////////////
+#---------------------------------------------------------------------
+# Extract time series of lead offset along transects from image pairs.
+#---------------------------------------------------------------------
+
+
+#//////////////////////
+#  make_Transects  ///
+#////////////////////
+#---------------------------------------------------------------------
+# Make fixed geodesic transects from origin points and azimuths.
+#---------------------------------------------------------------------
+# DEPENDENCIES:
+import numpy as np
+from pyproj import Geod
+#---------------------------------------------------------------------
+
+def make_Transects(origins, azimuths, length_km = 200, step_km = 1):
+
+    """Make fixed geodesic transects from origin points and azimuths.
+
+INPUT:
+- origins: array of transect origin coordinates (Mx2 with [Lat, Lon])
+           (e.g. points along the coast off Point Barrow)
+- azimuths: array of M transect azimuths (degrees clockwise from north)
+            (e.g. perpendicular to the coast, pointing offshore)
+- length_km: transect length (km) (default: 200)
+- step_km: geodesic step size between transect points (km) (default: 1)
+
+OUTPUT:
+- TLat: MxN array of transect latitudes
+- TLon: MxN array of transect longitudes (0-360)
+- dist_km: array of N distances (km) of transect points from origin
+
+DEPENDENCIES:
+import numpy as np
+from pyproj import Geod
+
+Latest recorded update:
+10-19-2026
+
+    """
+
+    origins = np.atleast_2d(np.asarray(origins, dtype=float))
+    azimuths = np.atleast_1d(np.asarray(azimuths, dtype=float))
+    assert origins.shape[0] == azimuths.shape[0], f"need one azimuth per origin, got: {azimuths.shape[0]} for {origins.shape[0]}"
+
+    # distances along transect
+    dist_km = np.arange(0, length_km + step_km/2, step_km)
+
+    # broadcast origins and azimuths against distances (M x N)
+    lat0 = np.repeat(origins[:,0][:,None], dist_km.shape[0], axis=1)
+    lon0 = np.repeat(origins[:,1][:,None], dist_km.shape[0], axis=1)
+    az = np.repeat(azimuths[:,None], dist_km.shape[0], axis=1)
+    dist = np.repeat(dist_km[None,:]*1000, origins.shape[0], axis=0)
+
+    # step along geodesics from origins
+    TLon, TLat, _ = Geod(ellps='WGS84').fwd(lon0, lat0, az, dist)
+
+    # convert to only positive longitude values
+    TLon[TLon < 0] += 360
+
+    return TLat, TLon, dist_km
+
+
+
+#////////////////////////
+#  sample_Transects  ///
+#//////////////////////
+#---------------------------------------------------------------------
+# Sample swath imagery along transects (nearest pixel).
+#---------------------------------------------------------------------
+# DEPENDENCIES:
+import numpy as np
+from pyproj import CRS
+from scipy.spatial import cKDTree
+# homemade:
+from LIB_lead_geom import transform_coords_chunked
+#---------------------------------------------------------------------
+
+def sample_Transects(band_data, geolat, geolon, TLat, TLon, max_dist_km = 3, pad_deg = 0.5):
+
+    """Sample swath imagery along transects using nearest swath pixel.
+    Swath is cropped to the transects' lat/lon bounding box before
+    searching, so full granules are never projected.
+
+INPUT:
+- band_data: swath band data (e.g. from load_MODISband), masked or with NaNs for bad data
+- geolat: swath latitudes (e.g. from get_MODISgeo), same shape as band_data
+- geolon: swath longitudes (0-360) (e.g. from get_MODISgeo), same shape as band_data
+- TLat: MxN array of transect latitudes (e.g. from make_Transects)
+- TLon: MxN array of transect longitudes (0-360) (e.g. from make_Transects)
+- max_dist_km: max distance from transect point to nearest pixel (km),
+               points farther from valid pixels are NaN (default: 3)
+               MODIS 1 km pixels grow to ~2 x 4.8 km near scan edge, so values
+               much below ~3 km leave off-nadir transects mostly NaN
+- pad_deg: padding added to transect bounding box when cropping swath (degrees) (default: 0.5)
+
+OUTPUT:
+- samples: MxN array of band values along transects (NaN where not covered)
+
+DEPENDENCIES:
+import numpy as np
+from pyproj import CRS
+from scipy.spatial import cKDTree
+# homemade:
+from LIB_lead_geom import transform_coords_chunked
+
+Latest recorded update:
+10-19-2026
+
+    """
+
+    samples = np.full(np.shape(TLat), np.nan)
+
+    # crop swath to rows/cols overlapping transect bounding box
+    #----------------------------------------------------------
+    in_box = ((geolat >= np.min(TLat)-pad_deg) & (geolat <= np.max(TLat)+pad_deg) &
+              (geolon >= np.min(TLon)-pad_deg) & (geolon <= np.max(TLon)+pad_deg))
+    if not np.any(in_box):
+        return samples
+    rows = np.where(np.any(in_box, axis=1))[0]
+    cols = np.where(np.any(in_box, axis=0))[0]
+    crop = (slice(rows[0], rows[-1]+1), slice(cols[0], cols[-1]+1))
+
+    # keep valid pixels only
+    data = np.ma.filled(np.ma.masked_invalid(band_data[crop]), np.nan)
+    valid = ~np.isnan(data)
+    if not np.any(valid):
+        return samples
+
+    # project pixels and transect points to polar stereographic (meters)
+    # centered on transects so nearest-neighbor distances are ~true distances
+    #-------------------------------------------------------------------------
+    PROJ = CRS.from_proj4(f'+proj=stere +lat_0=90 +lat_ts=90 +lon_0={np.mean(TLon):.3f} +ellps=WGS84')
+    px, py = transform_coords_chunked(geolon[crop][valid], geolat[crop][valid], dst_crs=PROJ)
+    tx, ty = transform_coords_chunked(TLon, TLat, dst_crs=PROJ)
+
+    # nearest valid pixel to each transect point
+    #-------------------------------------------
+    dist, index = cKDTree(np.array([px, py]).T).query(np.array([tx.ravel(), ty.ravel()]).T,
+                                                     distance_upper_bound=max_dist_km*1000)
+    found = np.isfinite(dist)
+    samples.ravel()[found] = data[valid][index[found]]
+
+    return samples
+
+
+
+#///////////////////////
+#  locate_LeadPeak  ///
+#/////////////////////
+#---------------------------------------------------------------------
+# Locate lead along transects as warm-anomaly peak.
+#---------------------------------------------------------------------
+# DEPENDENCIES:
+import numpy as np
+#---------------------------------------------------------------------
+
+def locate_LeadPeak(samples, dist_km, min_anomaly = 0.3, min_anomaly_mad = 5, min_coverage = 0.5):
+
+    """Locate lead along transects as peak of warm anomaly in band 31 radiance.
+    Anomaly is taken relative to the median along each transect. A peak counts
+    as a lead only if it exceeds both an absolute threshold and a multiple of the
+    robust spread (1.4826 x median absolute deviation) along the transect, so
+    ordinary temperature variation across the pack is not reported as a lead.
+
+INPUT:
+- samples: MxN array of band values along transects (e.g. from sample_Transects)
+- dist_km: array of N distances (km) of transect points from origin
+- min_anomaly: minimum peak anomaly (band units) to count as a lead,
+               weaker peaks return NaN offset (default: 0.3)
+               near 250 K, band 31 radiance changes ~0.06 W/m2/um/sr per K, so
+               0.3 is ~5 K, below the contrast of refrozen leads over winter pack
+               but above typical background variation
+- min_anomaly_mad: minimum peak anomaly as multiple of robust spread along
+                   transect (default: 5)
+- min_coverage: minimum fraction of valid samples along transect,
+                transects with less coverage return NaN offset (default: 0.5)
+
+OUTPUT:
+- offset_km: array of M lead distances (km) from transect origins (NaN where no lead found)
+- peak_anomaly: array of M peak anomalies (band units)
+
+DEPENDENCIES:
+import numpy as np
+
+Latest recorded update:
+10-19-2026
+
+    """
+
+    samples = np.atleast_2d(samples)
+    offset_km = np.full(samples.shape[0], np.nan)
+    peak_anomaly = np.full(samples.shape[0], np.nan)
+
+    # only search transects with enough valid samples
+    coverage = np.mean(~np.isnan(samples), axis=1)
+    good = coverage >= max(min_coverage, 1/samples.shape[1])
+    if not np.any(good):
+        return offset_km, peak_anomaly
+
+    # warm anomaly relative to transect median
+    #-----------------------------------------
+    anomaly = samples[good] - np.nanmedian(samples[good], axis=1)[:,None]
+    peak = np.argmax(np.where(np.isnan(anomaly), -np.inf, anomaly), axis=1)
+    peak_anomaly[good] = anomaly[np.arange(anomaly.shape[0]), peak]
+    offset_km[good] = np.asarray(dist_km)[peak]
+
+    # discard peaks too weak to be a lead, in absolute terms
+    # or relative to robust spread along transect
+    spread = np.full(samples.shape[0], np.nan)
+    spread[good] = 1.4826 * np.nanmedian(np.abs(anomaly), axis=1)
+    offset_km[(peak_anomaly < min_anomaly) | (peak_anomaly < min_anomaly_mad*spread)] = np.nan
+
+    return offset_km, peak_anomaly
+
+
+
+#//////////////////////////////
+#  extract_LeadTimeseries  ///
+#////////////////////////////
+#---------------------------------------------------------------------
+# Extract time series of lead offset along transects from image pairs.
+#---------------------------------------------------------------------
+# DEPENDENCIES:
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+# homemade:
+from LIB_plot_MODIS_LE import load_MODISband, get_MODISgeo
+#---------------------------------------------------------------------
+
+def _process_Pair(pair_meta, TLat, TLon, dist_km, max_dist_km, min_anomaly, min_anomaly_mad, min_coverage):
+    # sample band 31 along transects for each granule in pair,
+    # filling gaps of earlier granules with later ones, then locate lead
+    # granules whose files fail to load are reported and skipped
+    samples = np.full(np.shape(TLat), np.nan)
+    for image_meta in pair_meta:
+        file = image_meta[3]+image_meta[2]
+        try:
+            band_data = load_MODISband(file, 'EV_1KM_Emissive', '31', 'radiance')
+            file = image_meta[3]+image_meta[1]
+            geolat, geolon = get_MODISgeo(file)
+        except Exception as e:
+            print(f'{e}, error loading {file} ({image_meta[0]}), granule skipped')
+            continue
+        granule_samples = sample_Transects(band_data, geolat, geolon, TLat, TLon, max_dist_km=max_dist_km)
+        samples = np.where(np.isnan(samples), granule_samples, samples)
+    offset_km, peak_anomaly = locate_LeadPeak(samples, dist_km, min_anomaly=min_anomaly,
+                                              min_anomaly_mad=min_anomaly_mad, min_coverage=min_coverage)
+    return pair_meta[0][0], offset_km, peak_anomaly
+
+
+def extract_LeadTimeseries(Image_Meta_paired, TLat, TLon, dist_km, max_workers = None,
+                           max_dist_km = 3, min_anomaly = 0.3, min_anomaly_mad = 5, min_coverage = 0.5):
+
+    """Extract time series of lead offset along fixed transects from paired MODIS images.
+    Each image pair (composite) is processed in a separate worker process: band 31
+    radiance is loaded, sampled along transects, and the lead located as the
+    warm-anomaly peak. Granules with files that fail to load are reported and
+    skipped, so one bad granule does not stop the run (a pair with no loadable
+    granules gets NaN offsets).
+
+INPUT:
+- Image_Meta_paired: M x 5 array of paired image metadata from pair_images_meta
+                     [date, geo_filename, image_filename, filepath, pair_index]
+- TLat: KxN array of transect latitudes (e.g. from make_Transects)
+- TLon: KxN array of transect longitudes (0-360) (e.g. from make_Transects)
+- dist_km: array of N distances (km) of transect points from origin
+- max_workers: number of worker processes (default: None, uses number of CPUs)
+- max_dist_km: max distance from transect point to nearest pixel (km) (default: 3)
+- min_anomaly: minimum peak anomaly (W/m2/um/sr) to count as a lead (default: 0.3, ~5 K)
+- min_anomaly_mad: minimum peak anomaly as multiple of robust spread along transect (default: 5)
+- min_coverage: minimum fraction of valid samples along transect (default: 0.5)
+
+OUTPUT:
+- df: pandas DataFrame with one row per image pair sorted by date, columns
+      'date', 'pair_index', and for each transect k 'offset_km_k' (lead distance
+      from origin, NaN where no lead found or no granule loaded) and 'anomaly_k' (peak anomaly)
+
+DEPENDENCIES:
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+# homemade:
+from LIB_plot_MODIS_LE import load_MODISband, get_MODISgeo
+
+Latest recorded update:
+10-19-2026
+
+    """
+
+    pair_indices = np.unique(Image_Meta_paired[:,4].astype(int))
+
+    # process image pairs in parallel
+    #--------------------------------
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_process_Pair, Image_Meta_paired[Image_Meta_paired[:,4]==pair_index],
+                                   TLat, TLon, dist_km, max_dist_km, min_anomaly, min_anomaly_mad, min_coverage)
+                   for pair_index in pair_indices]
+        results = [future.result() for future in futures]
+
+    # gather results into data frame
+    #-------------------------------
+    rows = []
+    for pair_index, (ImageDate, offset_km, peak_anomaly) in zip(pair_indices, results):
+        row = {'date': ImageDate, 'pair_index': pair_index}
+        for kk in range(len(offset_km)):
+            row[f'offset_km_{kk}'] = offset_km[kk]
+            row[f'anomaly_{kk}'] = peak_anomaly[kk]
+        rows.append(row)
+    df = pd.DataFrame(rows).sort_values('date').reset_index(drop=True)
+
+    return df